@@ -1,139 +1,415 @@
 import streamlit as st
+import matplotlib
+matplotlib.use('Agg')  # Headless raster backend - the plot is only ever sent as a PNG
 import matplotlib.pyplot as plt
 import numpy as np
+import threading
+from collections import Counter, namedtuple
+from streamlit.logger import get_logger
+
+try:
+    from numba import njit
+    from numba.extending import register_jitable
+except ImportError:  # Numba is optional - fall back to NumPy broadcasting
+    njit = None
+
+# Streamlit's own console handler and level, so cache hits and misses show with
+# `streamlit run heat_pump.py --logger.level=debug`
+logger = get_logger(__name__)
 
 # Minimal header
 st.title("Heat Pump Efficiency Visualiser")
 st.caption("Interactive tool - theory explained in accompanying essay")
 
-# Functions
-def calculate_realistic_cop(T_outside_C, T_water_C, current_heat_load_kW,
-                           humidity=70, include_defrost=True,
-                           include_parasitics=True, system_efficiency=50,
-                           include_hex_penalty=True, include_part_load=True,
-                           delta_T_source=7.0, delta_T_sink=4.0,
-                           max_capacity_kW=14.0):
-    """
-    Calculate realistic COP accounting for:
-    - Heat exchanger temperature lift (separate for source and sink)
-    - System efficiency (compressor losses)
-    - Defrost cycles
-    - Parasitic loads (fans, pumps)
-    - Part-load inverter efficiency
-    """
+# Model switches packed into one int - a single cheap cache key / JIT argument
+DEFROST = 1
+PARASITICS = 2
+HEX_PENALTY = 4
+PART_LOAD = 8
+ALL_EFFECTS = DEFROST | PARASITICS | HEX_PENALTY | PART_LOAD
 
-    # 1. CONVERT TO KELVIN
-    T_outside_K = T_outside_C + 273.15
-    T_water_K = T_water_C + 273.15
+# One field per model output; arrays of these in the sweep (SoA)
+CopResult = namedtuple('CopResult', 'cop carnot_cop raw_cop defrost_penalty '
+                                    'inverter_correction load_factor T_evap T_cond')
 
+# Functions
+# Model stages that depend on only some inputs, so the breakdown can
+# compute a single field without running the whole model
+def _hex_temperatures_K(T_outside_C, T_water_C, delta_T_source, delta_T_sink, flags):
+    """(T_evap_K, T_cond_K) after the heat exchanger approach temperatures."""
+    # 1. CONVERT TO KELVIN
     # 2. APPLY HEAT EXCHANGER PENALTY (The "Real" Lift)
-    # More realistic: different penalties for source (air) and sink (water)
-    if include_hex_penalty:
-        T_evap_K = T_outside_K - delta_T_source  # Harder to extract from air
-        T_cond_K = T_water_K + delta_T_sink      # Easier to reject to water
+    # More realistic: different penalties for source (air) and sink (water).
+    # Evaporator depends only on outdoor, condenser only on water
+    if flags & HEX_PENALTY:
+        T_evap_K = T_outside_C + 273.15 - delta_T_source  # Harder to extract from air
+        T_cond_K = T_water_C + 273.15 + delta_T_sink      # Easier to reject to water
     else:
-        T_evap_K = T_outside_K
-        T_cond_K = T_water_K
+        T_evap_K = T_outside_C + 273.15
+        T_cond_K = T_water_C + 273.15
+    return T_evap_K, T_cond_K
+
+def _defrost_penalty(T_outside_C, humidity, flags):
+    """Defrost multiplier on COP - depends only on outdoor air conditions."""
+    # Straight-line 0/1 masks rather than if/elif, so a sweep has no branches
+    # mask_a: frost band near 0°C, mask_b: wider band if not already in mask_a
+    defrost_on = (flags & DEFROST) != 0
+    mask_a = defrost_on & (T_outside_C >= -2) & (T_outside_C <= 3) & (humidity > 60)
+    mask_b = (1 - mask_a) * (defrost_on & (T_outside_C >= -5) & (T_outside_C <= 5) & (humidity > 70))
+    humidity_factor = (humidity - 60) / 40
+    penalty_a = 0.88 - (0.05 * humidity_factor)
+    return mask_a * penalty_a + mask_b * 0.90 + (1 - mask_a - mask_b) * 1.0
+
+def _inverter_correction(current_heat_load_kW, max_capacity_kW, flags):
+    """(inverter_correction, load_factor) - independent of temperature."""
+    # Calculate actual load factor based on demand vs capacity
+    inverter_correction = 1.0
+    load_factor = 1.0
+    if flags & PART_LOAD:
+        # Load factor: how hard the unit is working (0.0 to 1.0+)
+        load_factor = current_heat_load_kW / max_capacity_kW
+        # Clamp: min speed 15%, slight overload 110%
+        clamped = 0.15 if load_factor < 0.15 else 1.1 if load_factor > 1.1 else load_factor
+
+        # Polynomial curve: peaks at 50% load, drops at extremes
+        # Formula: -0.8x^2 + 0.8x + 0.8, evaluated in Horner form
+        # At 50% load -> 1.0 (optimal), at 100% -> 0.8 (friction losses), at 15% -> 0.71 (cycling)
+        inverter_correction = 0.8 + clamped * (0.8 - 0.8 * clamped)
+    return inverter_correction, load_factor
+
+def _cop_from_kelvin(T_outside_C, T_evap_K, T_cond_K, current_heat_load_kW,
+                     humidity, system_efficiency, max_capacity_kW, flags):
+    """
+    Core COP model on a single outdoor temperature, given the evaporator
+    and condenser temperatures already in Kelvin (see calculate_realistic_cop).
+    Only arithmetic on the temperatures, so the same code also runs
+    element-wise on a NumPy array when Numba is unavailable.
+    Returns a plain tuple in CopResult field order.
+    """
 
     # 3. CARNOT EFFICIENCY (Theoretical Max)
-    carnot_cop = T_cond_K / (T_cond_K - T_evap_K)
+    lift_K = T_cond_K - T_evap_K
+    carnot_cop = T_cond_K / lift_K
 
     # 4. SYSTEM EFFICIENCY (Compressor losses, friction, etc)
     raw_cop = carnot_cop * (system_efficiency / 100)
 
     # 5. DEFROST PENALTY
-    defrost_penalty = 1.0
-    if include_defrost:
-        if -2 <= T_outside_C <= 3 and humidity > 60:
-            humidity_factor = (humidity - 60) / 40
-            defrost_penalty = 0.88 - (0.05 * humidity_factor)
-        elif -5 <= T_outside_C <= 5 and humidity > 70:
-            defrost_penalty = 0.90
+    defrost_penalty = _defrost_penalty(T_outside_C, humidity, flags)
 
-    raw_cop *= defrost_penalty
+    raw_cop = raw_cop * defrost_penalty
 
     # 6. PART-LOAD CORRECTION (Inverter Efficiency)
-    # Calculate actual load factor based on demand vs capacity
-    inverter_correction = 1.0
-    if include_part_load:
-        # Load factor: how hard the unit is working (0.0 to 1.0+)
-        load_factor = current_heat_load_kW / max_capacity_kW
-        load_factor = max(0.15, min(1.1, load_factor))  # Clamp: min speed 15%, slight overload 110%
+    inverter_correction, load_factor = _inverter_correction(
+        current_heat_load_kW, max_capacity_kW, flags)
 
-        # Polynomial curve: peaks at 50% load, drops at extremes
-        # Formula: -0.8x^2 + 0.8x + 0.8
-        # At 50% load -> 1.0 (optimal), at 100% -> 0.8 (friction losses), at 15% -> 0.71 (cycling)
-        inverter_correction = (-0.8 * (load_factor**2)) + (0.8 * load_factor) + 0.8
-
-    raw_cop *= inverter_correction
+    raw_cop = raw_cop * inverter_correction
 
     # 7. PARASITIC LOADS (Fans & Pumps)
-    if include_parasitics and current_heat_load_kW > 0:
-        compressor_power_kW = current_heat_load_kW / raw_cop
+    if flags & PARASITICS and current_heat_load_kW > 0:
         fan_pump_power_kW = 0.150
 
-        total_power_input = compressor_power_kW + fan_pump_power_kW
-        real_cop = current_heat_load_kW / total_power_input
+        # load / (load/raw_cop + fan_pump), multiplied through by raw_cop
+        # so only one division remains
+        real_cop = (raw_cop * current_heat_load_kW
+                    / (current_heat_load_kW + fan_pump_power_kW * raw_cop))
     else:
         real_cop = raw_cop
 
-    return {
-        'cop': real_cop,
-        'carnot_cop': carnot_cop,
-        'raw_cop': raw_cop,
-        'defrost_penalty': defrost_penalty,
-        'inverter_correction': inverter_correction if include_part_load else 1.0,
-        'load_factor': (current_heat_load_kW / max_capacity_kW) if include_part_load else 1.0,
-        'T_evap': T_evap_K - 273.15,
-        'T_cond': T_cond_K - 273.15
-    }
+    return (real_cop, carnot_cop, raw_cop, defrost_penalty,
+            inverter_correction, load_factor,
+            T_evap_K - 273.15, T_cond_K - 273.15)
 
-# Sidebar - more compact
-with st.sidebar:
-    st.header("System Configuration")
+def _cop_sweep_numpy(T_arr, *args):
+    """
+    Full sweep (every CopResult field): run the kernel once over the whole
+    array. Only the fast sweep is compiled - the app never needs the
+    breakdown fields over a grid.
+    Inputs are not pre-broadcast, so on an (outdoor, water) grid the defrost
+    term is computed per outdoor row and only the Carnot stage is 2-D.
+    """
+    return tuple(np.broadcast_arrays(*_cop_from_kelvin(T_arr, *args)))
+
+def _cop_sweep_fast_numpy(T_arr, *args):
+    """Fallback fast sweep: (cop, carnot_cop, raw_cop) arrays only."""
+    return tuple(np.broadcast_arrays(*_cop_from_kelvin(T_arr, *args)[:3]))
+
+def _flat_sweep(jitted_sweep):
+    """Broadcast inputs, run a compiled 1-D sweep and restore the shape."""
+    def sweep(T_arr, T_evap_K, T_cond_K, *args):
+        T_arr, T_evap_K, T_cond_K = np.broadcast_arrays(T_arr, T_evap_K, T_cond_K)
+        out = jitted_sweep(T_arr.ravel(), T_evap_K.ravel(), T_cond_K.ravel(), *args)
+        return tuple(x.reshape(T_arr.shape) for x in out)
+    return sweep
+
+# Per-point loop for the compiled fast sweep (see load_cop_kernels)
+def _cop_sweep_fast_loop(T_arr, T_evap_K, T_cond_K, current_heat_load_kW, humidity,
+                         system_efficiency, max_capacity_kW, flags):
+    n = T_arr.size
+    cop = np.empty(n)
+    carnot_cop = np.empty(n)
+    raw_cop = np.empty(n)
+    for i in range(n):
+        r = _cop_from_kelvin(T_arr[i], T_evap_K[i], T_cond_K[i], current_heat_load_kW,
+                             humidity, system_efficiency, max_capacity_kW, flags)
+        cop[i] = r[0]
+        carnot_cop[i] = r[1]
+        raw_cop[i] = r[2]
+    return cop, carnot_cop, raw_cop
+
+@st.cache_resource
+def load_cop_kernels():
+    """
+    (kernel, sweep_fast) for this process. JIT-wrapping happens here,
+    once per process rather than on every rerun; the wrapped functions are
+    module-level, so cache=True still loads them from disk after a restart.
+    """
+    if njit is None:
+        return _cop_from_kelvin, _cop_sweep_fast_numpy
 
-    system_efficiency = st.slider(
-        "System Efficiency (% of Carnot)",
-        40, 60, 50, 1
-    )
+    # Let compiled code call the stages and the kernel. They stay plain Python
+    # functions, so the breakdown's scalar calls never touch a dispatcher
+    for stage in (_defrost_penalty, _inverter_correction, _cop_from_kelvin):
+        register_jitable(fastmath=True)(stage)
 
-    heat_load = st.slider(
-        "Heat Demand (kW)",
-        1.0, 12.0, 6.0, 0.5
-    )
+    def jit(fn):
+        return njit(cache=True, fastmath=True)(fn)
 
-    max_capacity = st.slider(
-        "Unit Max Capacity (kW)",
-        8.0, 16.0, 14.0, 0.5,
-        help="Rated capacity affects part-load efficiency"
-    )
+    return jit(_cop_from_kelvin), _flat_sweep(jit(_cop_sweep_fast_loop))
 
-    st.divider()
-    st.subheader("Model Realism")
+def snap(x, step):
+    """Round x to the nearest multiple of step (the slider grid)."""
+    return round(x / step) * step
 
-    include_hex_penalty = st.checkbox("Heat Exchanger Losses", value=True)
+def pack_flags(include_defrost=True, include_parasitics=True,
+               include_hex_penalty=True, include_part_load=True):
+    """Combine the model realism switches into one int bitmask."""
+    return ((DEFROST if include_defrost else 0)
+            | (PARASITICS if include_parasitics else 0)
+            | (HEX_PENALTY if include_hex_penalty else 0)
+            | (PART_LOAD if include_part_load else 0))
 
-    if include_hex_penalty:
-        col1, col2 = st.columns(2)
-        with col1:
-            delta_T_source = st.slider("ΔT Source (°C)", 3.0, 10.0, 7.0, 0.5,
-                                      help="Temperature penalty extracting heat from air")
-        with col2:
-            delta_T_sink = st.slider("ΔT Sink (°C)", 2.0, 8.0, 4.0, 0.5,
-                                    help="Temperature penalty rejecting heat to water")
+def calculate_realistic_cop(T_outside_C, T_water_C, current_heat_load_kW,
+                           humidity=70, system_efficiency=50,
+                           flags=ALL_EFFECTS,
+                           delta_T_source=7.0, delta_T_sink=4.0,
+                           max_capacity_kW=14.0, fast=False):
+    """
+    Calculate realistic COP accounting for:
+    - Heat exchanger temperature lift (separate for source and sink)
+    - System efficiency (compressor losses)
+    - Defrost cycles
+    - Parasitic loads (fans, pumps)
+    - Part-load inverter efficiency
+
+    flags selects which of these apply (see pack_flags).
+    T_outside_C and T_water_C may be scalars or arrays that broadcast
+    together; array input returns arrays, so a whole curve or
+    (outdoor, water) grid is one call.
+    fast=True returns only (cop, carnot_cop, raw_cop) - all a sweep needs.
+    """
+
+    # Plain Python numbers take a pure-float path with no NumPy calls at all
+    scalar = all(isinstance(T, (int, float)) or np.ndim(T) == 0
+                 for T in (T_outside_C, T_water_C))
+    if scalar:
+        T_outside_C, T_water_C = float(T_outside_C), float(T_water_C)
     else:
-        delta_T_source = 7.0
-        delta_T_sink = 4.0
+        T_outside_C = np.asarray(T_outside_C, dtype=float)
+        T_water_C = np.asarray(T_water_C, dtype=float)
+
+    # Done once here rather than per point inside the kernel
+    T_evap_K, T_cond_K = _hex_temperatures_K(T_outside_C, T_water_C,
+                                             delta_T_source, delta_T_sink, flags)
+
+    # Floats throughout so the JIT sees one stable signature
+    args = (float(current_heat_load_kW), float(humidity),
+            float(system_efficiency), float(max_capacity_kW), flags)
+
+    kernel, sweep_fast = load_cop_kernels()
+    if scalar:
+        r = kernel(T_outside_C, T_evap_K, T_cond_K, *args)
+        return r[:3] if fast else CopResult(*r)
+    if fast:
+        return sweep_fast(T_outside_C, T_evap_K, T_cond_K, *args)
+    return CopResult(*_cop_sweep_numpy(T_outside_C, T_evap_K, T_cond_K, *args))
+
+# Lookup grid: the plotted range plus every whole degree, so slider values
+# and seasonal temperatures land exactly on a node (the defrost band edges
+# are discontinuities that interpolation would otherwise smear)
+T_OUT_GRID = np.union1d(np.linspace(-15, 15, 100), np.arange(-15.0, 16.0))
+T_WATER_GRID = np.arange(35.0, 56.0)  # matches the flow temperature slider step
+
+@st.cache_resource
+def cache_stats():
+    """Hit/miss counts per cached function, shared by every session."""
+    return {name: Counter() for name in
+            ('build_cop_table', 'compute_curves', 'compute_seasonal')}
+
+def cached_call(fn, *key):
+    """Call a cached function, counting and logging the hit or miss with its key."""
+    stats = cache_stats()[fn.__name__]
+    misses = stats['miss']
+    result = fn(*key)
+    # Cached bodies only run on a miss, and each one counts itself
+    outcome = 'miss' if stats['miss'] > misses else 'hit'
+    if outcome == 'hit':
+        stats['hit'] += 1
+    logger.debug("%s cache %s (%d hits, %d misses): key=%s", fn.__name__,
+                 outcome, stats['hit'], stats['miss'], key)
+    return result
+
+@st.cache_data(max_entries=256)
+def build_cop_table(heat_load, humidity, flags, system_efficiency,
+                    delta_T_source, delta_T_sink, max_capacity):
+    """
+    COP over the (outdoor, water) temperature grid in a single broadcast call.
+    Returns (T_out_grid, T_w_grid, cop_table, carnot_table, raw_table),
+    tables indexed [outdoor, water].
+    """
+    cache_stats()['build_cop_table']['miss'] += 1
+    cop_table, carnot_table, raw_table = calculate_realistic_cop(
+        T_OUT_GRID[:, None], T_WATER_GRID[None, :], heat_load,
+        humidity=humidity,
+        system_efficiency=system_efficiency,
+        flags=flags,
+        delta_T_source=delta_T_source,
+        delta_T_sink=delta_T_sink,
+        max_capacity_kW=max_capacity,
+        fast=True
+    )
+    return T_OUT_GRID, T_WATER_GRID, cop_table, carnot_table, raw_table
+
+def interpolate_cop(table, T_outside_C, water_temp):
+    """(cop, carnot_cop, raw_cop) at T_outside_C on the nearest water slice."""
+    T_out_grid, T_w_grid, cop_table, carnot_table, raw_table = table
+    j = np.abs(T_w_grid - water_temp).argmin()
+    return (np.interp(T_outside_C, T_out_grid, cop_table[:, j]),
+            np.interp(T_outside_C, T_out_grid, carnot_table[:, j]),
+            np.interp(T_outside_C, T_out_grid, raw_table[:, j]))
+
+def table_point(table, T_outside_C, water_temp):
+    """
+    (cop, carnot_cop, raw_cop) at one grid node, read by index - no model
+    evaluation. Any whole degree is a node; other temperatures interpolate.
+    """
+    T_out_grid, T_w_grid, cop_table, carnot_table, raw_table = table
+    i = np.searchsorted(T_out_grid, T_outside_C)
+    if i == len(T_out_grid) or T_out_grid[i] != T_outside_C:
+        return tuple(float(x) for x in interpolate_cop(table, T_outside_C, water_temp))
+    j = np.abs(T_w_grid - water_temp).argmin()
+    return float(cop_table[i, j]), float(carnot_table[i, j]), float(raw_table[i, j])
+
+@st.cache_data(max_entries=256)
+def compute_curves(water_temp, heat_load, humidity, flags, system_efficiency,
+                   delta_T_source, delta_T_sink, max_capacity):
+    """
+    COP curves over the plotted outdoor range.
+    Outdoor temperature is deliberately not a key - it only moves the marker.
+    """
+    cache_stats()['compute_curves']['miss'] += 1
+    outdoor_range = np.linspace(-15, 15, 100)
+    table = cached_call(build_cop_table, heat_load, humidity, flags, system_efficiency,
+                        delta_T_source, delta_T_sink, max_capacity)
+    real_curve, carnot_curve, ideal_curve = interpolate_cop(table, outdoor_range, water_temp)
+    return outdoor_range, carnot_curve, ideal_curve, real_curve
+
+@st.cache_data(max_entries=256)
+def compute_seasonal(temps, water_temp, heat_load, humidity, flags,
+                     system_efficiency, delta_T_source, delta_T_sink, max_capacity):
+    """Real COP at each of the seasonal reference temperatures."""
+    cache_stats()['compute_seasonal']['miss'] += 1
+    table = cached_call(build_cop_table, heat_load, humidity, flags, system_efficiency,
+                        delta_T_source, delta_T_sink, max_capacity)
+    return interpolate_cop(table, np.asarray(temps, dtype=float), water_temp)[0]
+
+@st.cache_resource
+def make_figure():
+    """
+    Plot skeleton built once per process; reruns only swap line data.
+    The lock serialises sessions that share the cached figure.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    lines = {
+        'carnot': ax.plot([], [], label='Carnot Limit',
+                          color='#00d9ff', linewidth=2, linestyle='--', alpha=0.7)[0],
+        'ideal': ax.plot([], [], label='Ideal',
+                         color='#00cc66', linewidth=2, linestyle='-.')[0],
+        'real': ax.plot([], [], label='Real-World',
+                        color='#ff3366', linewidth=3)[0],
+        'marker': ax.plot([], [], 'o', color='#ffcc00',
+                          markersize=12, label='Current', zorder=5)[0],
+        'defrost_zone': None
+    }
 
+    ax.axhline(y=1, color='gray', linestyle=':', linewidth=2, alpha=0.5)
+
+    ax.set_xlabel('Outdoor Temperature (°C)', fontsize=12)
+    ax.set_ylabel('COP', fontsize=12)
+    ax.grid(True, alpha=0.3)
+
+    return fig, ax, lines, threading.Lock()
+
+# Sidebar - more compact
+with st.sidebar:
+    st.header("System Configuration")
+
+    # Switches outside the form, so each applies at once: the heat exchanger
+    # and defrost ones show or hide sliders that would otherwise lag an Apply
+    st.subheader("Model Realism")
+    include_hex_penalty = st.checkbox("Heat Exchanger Losses", value=True)
+    include_defrost = st.checkbox("Defrost Cycles", value=True)
     include_part_load = st.checkbox("Part-Load (Inverter)", value=True,
                                    help="Inverter efficiency varies with load")
-    include_defrost = st.checkbox("Defrost Cycles", value=True)
     include_parasitics = st.checkbox("Parasitic Loads", value=True)
 
-    if include_defrost:
-        humidity = st.slider("Relative Humidity (%)", 30, 90, 70, 5)
-    else:
-        humidity = 0
+    # Batched in a form: the model reruns once per "Apply", not per slider tweak
+    with st.form("config"):
+        system_efficiency = st.slider(
+            "System Efficiency (% of Carnot)",
+            40, 60, 50, 1
+        )
+
+        heat_load = st.slider(
+            "Heat Demand (kW)",
+            1.0, 12.0, 6.0, 0.5
+        )
+
+        max_capacity = st.slider(
+            "Unit Max Capacity (kW)",
+            8.0, 16.0, 14.0, 0.5,
+            help="Rated capacity affects part-load efficiency"
+        )
+
+        if include_hex_penalty:
+            col1, col2 = st.columns(2)
+            with col1:
+                delta_T_source = st.slider("ΔT Source (°C)", 3.0, 10.0, 7.0, 0.5,
+                                          help="Temperature penalty extracting heat from air")
+            with col2:
+                delta_T_sink = st.slider("ΔT Sink (°C)", 2.0, 8.0, 4.0, 0.5,
+                                        help="Temperature penalty rejecting heat to water")
+        else:
+            delta_T_source = 7.0
+            delta_T_sink = 4.0
+
+        if include_defrost:
+            humidity = st.slider("Relative Humidity (%)", 30, 90, 70, 5)
+        else:
+            humidity = 0
+
+        st.form_submit_button("Apply")
+
+flags = pack_flags(include_defrost, include_parasitics,
+                   include_hex_penalty, include_part_load)
+
+# Snap to the slider steps so float noise can never mint a new cache key
+heat_load = snap(heat_load, 0.5)
+max_capacity = snap(max_capacity, 0.5)
+delta_T_source = snap(delta_T_source, 0.5)
+delta_T_sink = snap(delta_T_sink, 0.5)
+humidity = int(snap(humidity, 5))
 
 # Main controls - clean layout
 water_temp = st.slider("Water Flow Temperature (°C)", 35.0, 55.0, 45.0, 1.0,
@@ -141,25 +417,19 @@ water_temp = st.slider("Water Flow Temperature (°C)", 35.0, 55.0, 45.0, 1.0,
 
 outdoor_temp = st.slider("Outdoor Temperature (°C)", -15.0, 15.0, 5.0, 1.0)
 
-# Calculate current performance
-result = calculate_realistic_cop(
-    outdoor_temp,
-    water_temp,
-    heat_load,
-    humidity=humidity,
-    include_defrost=include_defrost,
-    include_parasitics=include_parasitics,
-    system_efficiency=system_efficiency,
-    include_hex_penalty=include_hex_penalty,
-    include_part_load=include_part_load,
-    delta_T_source=delta_T_source,
-    delta_T_sink=delta_T_sink,
-    max_capacity_kW=max_capacity
-)
-
-current_cop = result['cop']
-carnot_cop = result['carnot_cop']
-raw_cop = result['raw_cop']
+# Current performance, read from the cached table rather than re-evaluated
+table = cached_call(build_cop_table, heat_load, humidity, flags, system_efficiency,
+                    delta_T_source, delta_T_sink, max_capacity)
+current_cop, carnot_cop, raw_cop = table_point(table, outdoor_temp, water_temp)
+
+# Breakdown-only fields: just the model stages that produce them
+T_evap_K, T_cond_K = _hex_temperatures_K(outdoor_temp, water_temp,
+                                         delta_T_source, delta_T_sink, flags)
+inverter_correction, load_factor = _inverter_correction(heat_load, max_capacity, flags)
+result = CopResult(current_cop, carnot_cop, raw_cop,
+                   _defrost_penalty(outdoor_temp, float(humidity), flags),
+                   inverter_correction, load_factor,
+                   T_evap_K - 273.15, T_cond_K - 273.15)
 electrical_power = heat_load / current_cop
 
 # Results - just numbers, no explanation
@@ -185,16 +455,16 @@ else:
 
 # Optional detailed breakdown
 with st.expander("Detailed Breakdown"):
-    st.write(f"**Evaporator Temperature:** {result['T_evap']:.1f}°C (outdoor air: {outdoor_temp:.1f}°C)")
-    st.write(f"**Condenser Temperature:** {result['T_cond']:.1f}°C (water flow: {water_temp:.1f}°C)")
-    st.write(f"**Temperature Lift:** {result['T_cond'] - result['T_evap']:.1f}°C")
+    st.write(f"**Evaporator Temperature:** {result.T_evap:.1f}°C (outdoor air: {outdoor_temp:.1f}°C)")
+    st.write(f"**Condenser Temperature:** {result.T_cond:.1f}°C (water flow: {water_temp:.1f}°C)")
+    st.write(f"**Temperature Lift:** {result.T_cond - result.T_evap:.1f}°C")
     st.write("---")
     st.write(f"**Carnot COP:** {carnot_cop:.2f}")
     st.write(f"**System Efficiency:** {system_efficiency}% → COP = {carnot_cop * system_efficiency/100:.2f}")
-    st.write(f"**Defrost Penalty:** {result['defrost_penalty']:.2%}")
+    st.write(f"**Defrost Penalty:** {result.defrost_penalty:.2%}")
     if include_part_load:
-        st.write(f"**Load Factor:** {result['load_factor']:.1%} ({heat_load:.1f}kW / {max_capacity:.1f}kW)")
-        st.write(f"**Inverter Correction:** {result['inverter_correction']:.2%}")
+        st.write(f"**Load Factor:** {result.load_factor:.1%} ({heat_load:.1f}kW / {max_capacity:.1f}kW)")
+        st.write(f"**Inverter Correction:** {result.inverter_correction:.2%}")
     st.write(f"**Pre-Parasitic COP:** {raw_cop:.2f}")
 
     if include_parasitics:
@@ -211,55 +481,35 @@ with st.expander("Detailed Breakdown"):
 # Graph - minimal annotations
 st.subheader("COP vs Outdoor Temperature")
 
-outdoor_range = np.linspace(-15, 15, 100)
-
-# Calculate COP curves
-carnot_curve = []
-ideal_curve = []
-real_curve = []
-
-for t in outdoor_range:
-    result_temp = calculate_realistic_cop(
-        t, water_temp, heat_load,
-        humidity=humidity,
-        include_defrost=include_defrost,
-        include_parasitics=include_parasitics,
-        system_efficiency=system_efficiency,
-        include_hex_penalty=include_hex_penalty,
-        include_part_load=include_part_load,
-        delta_T_source=delta_T_source,
-        delta_T_sink=delta_T_sink,
-        max_capacity_kW=max_capacity
-    )
-    carnot_curve.append(result_temp['carnot_cop'])
-    ideal_curve.append(result_temp['raw_cop'])
-    real_curve.append(result_temp['cop'])
-
-fig, ax = plt.subplots(figsize=(10, 6))
+# Calculate COP curves (cached - unchanged when only outdoor_temp moves)
+outdoor_range, carnot_curve, ideal_curve, real_curve = cached_call(
+    compute_curves, water_temp, heat_load, humidity, flags, system_efficiency,
+    delta_T_source, delta_T_sink, max_capacity
+)
 
-ax.plot(outdoor_range, carnot_curve, label='Carnot Limit',
-        color='#00d9ff', linewidth=2, linestyle='--', alpha=0.7)
-ax.plot(outdoor_range, ideal_curve, label=f'Ideal ({system_efficiency}%)',
-        color='#00cc66', linewidth=2, linestyle='-.')
-ax.plot(outdoor_range, real_curve, label='Real-World',
-        color='#ff3366', linewidth=3)
-ax.plot(outdoor_temp, current_cop, 'o', color='#ffcc00',
-        markersize=12, label='Current', zorder=5)
+fig, ax, lines, figure_lock = make_figure()
 
-# Minimal defrost zone (visual only)
-if include_defrost and humidity > 60:
-    ax.axvspan(-2, 3, alpha=0.1, color='blue')
+with figure_lock:
+    lines['carnot'].set_data(outdoor_range, carnot_curve)
+    lines['ideal'].set_data(outdoor_range, ideal_curve)
+    lines['ideal'].set_label(f'Ideal ({system_efficiency}%)')
+    lines['real'].set_data(outdoor_range, real_curve)
+    lines['marker'].set_data([outdoor_temp], [current_cop])
 
-ax.axhline(y=1, color='gray', linestyle=':', linewidth=2, alpha=0.5)
+    # Minimal defrost zone (visual only)
+    if lines['defrost_zone'] is not None:
+        lines['defrost_zone'].remove()
+        lines['defrost_zone'] = None
+    if include_defrost and humidity > 60:
+        lines['defrost_zone'] = ax.axvspan(-2, 3, alpha=0.1, color='blue')
 
-ax.set_xlabel('Outdoor Temperature (°C)', fontsize=12)
-ax.set_ylabel('COP', fontsize=12)
-ax.set_title(f'Water: {water_temp}°C | Load: {heat_load} kW', fontsize=11)
-ax.grid(True, alpha=0.3)
-ax.legend(fontsize=9)
-ax.set_ylim(0, min(max(carnot_curve) * 1.1, 20))
+    ax.set_title(f'Water: {water_temp}°C | Load: {heat_load} kW', fontsize=11)
+    ax.legend(fontsize=9)
+    ax.relim()
+    ax.autoscale_view(scaley=False)
+    ax.set_ylim(0, min(max(carnot_curve) * 1.1, 20))
 
-st.pyplot(fig, clear_figure=True)
+    st.pyplot(fig, clear_figure=False)
 
 # Seasonal comparison - just data
 st.subheader("Seasonal Performance")
@@ -268,14 +518,13 @@ col1, col2, col3, col4 = st.columns(4)
 temps = [-5, 0, 7, 12]
 labels = ["Winter -5°C", "Freezing 0°C", "Mild 7°C", "Spring 12°C"]
 
-for i, (temp, label) in enumerate(zip(temps, labels)):
-    result_temp = calculate_realistic_cop(temp, water_temp, heat_load, humidity,
-                                    include_defrost, include_parasitics,
-                                    system_efficiency, include_hex_penalty,
-                                    include_part_load, delta_T_source, delta_T_sink,
-                                    max_capacity)
+seasonal_cops = cached_call(compute_seasonal, tuple(temps), water_temp, heat_load,
+                            humidity, flags, system_efficiency, delta_T_source,
+                            delta_T_sink, max_capacity)
+
+for i, (cop, label) in enumerate(zip(seasonal_cops, labels)):
     with [col1, col2, col3, col4][i]:
-        st.metric(label, f"{result_temp['cop']:.2f}")
+        st.metric(label, f"{cop:.2f}")
 
 # Minimal footer
 st.divider()
@@ -0,0 +1,189 @@
+"""
+Equivalence checks: the bitmask kernel, its sweeps and the cached COP table
+must reproduce the original scalar model, with and without Numba.
+Run with `python -m unittest discover tests`.
+"""
+import importlib.util
+import itertools
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# The app is loaded under a module name other than __main__ here, so keep its
+# Numba disk cache away from the one `streamlit run` uses
+os.environ.setdefault("NUMBA_CACHE_DIR", tempfile.mkdtemp(prefix="heat_pump_numba_"))
+
+APP = Path(__file__).resolve().parent.parent / "heat_pump.py"
+
+
+def load_app(name, numba=True):
+    """Execute heat_pump.py in Streamlit bare mode and return it as a module."""
+    saved = sys.modules.get("numba")
+    if not numba:
+        sys.modules["numba"] = None  # makes `import numba` raise ImportError
+    try:
+        spec = importlib.util.spec_from_file_location(name, APP)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    finally:
+        if not numba:
+            if saved is None:
+                del sys.modules["numba"]
+            else:
+                sys.modules["numba"] = saved
+    return module
+
+
+def reference_cop(T_outside_C, T_water_C, current_heat_load_kW,
+                  humidity=70, include_defrost=True,
+                  include_parasitics=True, system_efficiency=50,
+                  include_hex_penalty=True, include_part_load=True,
+                  delta_T_source=7.0, delta_T_sink=4.0,
+                  max_capacity_kW=14.0):
+    """The original scalar model (comments trimmed), kept as the oracle."""
+    T_outside_K = T_outside_C + 273.15
+    T_water_K = T_water_C + 273.15
+
+    if include_hex_penalty:
+        T_evap_K = T_outside_K - delta_T_source
+        T_cond_K = T_water_K + delta_T_sink
+    else:
+        T_evap_K = T_outside_K
+        T_cond_K = T_water_K
+
+    carnot_cop = T_cond_K / (T_cond_K - T_evap_K)
+    raw_cop = carnot_cop * (system_efficiency / 100)
+
+    defrost_penalty = 1.0
+    if include_defrost:
+        if -2 <= T_outside_C <= 3 and humidity > 60:
+            humidity_factor = (humidity - 60) / 40
+            defrost_penalty = 0.88 - (0.05 * humidity_factor)
+        elif -5 <= T_outside_C <= 5 and humidity > 70:
+            defrost_penalty = 0.90
+
+    raw_cop *= defrost_penalty
+
+    inverter_correction = 1.0
+    if include_part_load:
+        load_factor = current_heat_load_kW / max_capacity_kW
+        load_factor = max(0.15, min(1.1, load_factor))
+        inverter_correction = (-0.8 * (load_factor**2)) + (0.8 * load_factor) + 0.8
+
+    raw_cop *= inverter_correction
+
+    if include_parasitics and current_heat_load_kW > 0:
+        compressor_power_kW = current_heat_load_kW / raw_cop
+        fan_pump_power_kW = 0.150
+
+        total_power_input = compressor_power_kW + fan_pump_power_kW
+        real_cop = current_heat_load_kW / total_power_input
+    else:
+        real_cop = raw_cop
+
+    return {
+        'cop': real_cop,
+        'carnot_cop': carnot_cop,
+        'raw_cop': raw_cop,
+        'defrost_penalty': defrost_penalty,
+        'inverter_correction': inverter_correction if include_part_load else 1.0,
+        'load_factor': (current_heat_load_kW / max_capacity_kW) if include_part_load else 1.0,
+        'T_evap': T_evap_K - 273.15,
+        'T_cond': T_cond_K - 273.15
+    }
+
+
+# Whole degrees plus the defrost band edges and a few off-grid points
+TEMPS = [float(t) for t in range(-15, 16)] + [-5.5, -2.5, -0.3, 2.9, 3.1, 4.99, 5.5]
+WATER_TEMPS = [35.0, 45.0, 55.0]
+HUMIDITIES = [0, 65, 70, 75, 90]
+LOADS = [1.0, 7.0, 12.0]
+SWITCHES = list(itertools.product([True, False], repeat=4))
+
+
+class ModelEquivalence:
+    """Checks shared by the NumPy and Numba paths; subclasses set `app`."""
+
+    app = None
+
+    def model_kwargs(self, humidity, switches):
+        include_defrost, include_parasitics, include_hex_penalty, include_part_load = switches
+        flags = self.app.pack_flags(include_defrost, include_parasitics,
+                                    include_hex_penalty, include_part_load)
+        reference = dict(humidity=humidity, include_defrost=include_defrost,
+                         include_parasitics=include_parasitics,
+                         include_hex_penalty=include_hex_penalty,
+                         include_part_load=include_part_load)
+        return flags, reference
+
+    def test_scalar_matches_reference(self):
+        for switches, humidity, load, water in itertools.product(
+                SWITCHES, HUMIDITIES, LOADS, WATER_TEMPS):
+            flags, reference = self.model_kwargs(humidity, switches)
+            for T in TEMPS:
+                expected = reference_cop(T, water, load, **reference)
+                result = self.app.calculate_realistic_cop(T, water, load,
+                                                          humidity=humidity, flags=flags)
+                for field, value in result._asdict().items():
+                    self.assertAlmostEqual(value, expected[field], places=12,
+                                           msg=(field, T, water, load, humidity, switches))
+
+    def test_sweeps_match_reference(self):
+        T_out = np.array(TEMPS)[:, None]
+        T_water = np.array(WATER_TEMPS)[None, :]
+        for switches, humidity in itertools.product(SWITCHES, HUMIDITIES):
+            flags, reference = self.model_kwargs(humidity, switches)
+            full = self.app.calculate_realistic_cop(T_out, T_water, 7.0,
+                                                    humidity=humidity, flags=flags)
+            fast = self.app.calculate_realistic_cop(T_out, T_water, 7.0,
+                                                    humidity=humidity, flags=flags, fast=True)
+            for field in self.app.CopResult._fields:
+                expected = [[reference_cop(T, w, 7.0, **reference)[field] for w in WATER_TEMPS]
+                            for T in TEMPS]
+                np.testing.assert_allclose(getattr(full, field), expected,
+                                           rtol=1e-12, atol=1e-12)
+                if field in ('cop', 'carnot_cop', 'raw_cop'):
+                    np.testing.assert_allclose(fast[self.app.CopResult._fields.index(field)],
+                                               expected, rtol=1e-12, atol=1e-12)
+
+    def test_table_matches_reference(self):
+        for switches, humidity in itertools.product(SWITCHES, HUMIDITIES):
+            flags, reference = self.model_kwargs(humidity, switches)
+            table = self.app.build_cop_table(7.0, humidity, flags, 50, 7.0, 4.0, 14.0)
+            for T, water in itertools.product(range(-15, 16), WATER_TEMPS):
+                expected = reference_cop(float(T), water, 7.0, **reference)
+                point = self.app.table_point(table, float(T), water)
+                np.testing.assert_allclose(
+                    point, [expected['cop'], expected['carnot_cop'], expected['raw_cop']],
+                    rtol=1e-12)
+
+    def test_table_point_off_grid_interpolates(self):
+        table = self.app.build_cop_table(7.0, 70, self.app.ALL_EFFECTS, 50, 7.0, 4.0, 14.0)
+        for T in (5.5, -14.9, 14.5):
+            expected = self.app.interpolate_cop(table, T, 45.0)
+            np.testing.assert_allclose(self.app.table_point(table, T, 45.0), expected)
+
+
+class NumpyPathTest(ModelEquivalence, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = load_app("heat_pump_numpy", numba=False)
+        assert cls.app.njit is None
+
+
+@unittest.skipIf(importlib.util.find_spec("numba") is None, "Numba not installed")
+class NumbaPathTest(ModelEquivalence, unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = load_app("heat_pump_numba")
+
+
+if __name__ == "__main__":
+    unittest.main()